@@ -6,10 +6,9 @@ def get_sort_key(filename):
     Extracts the URL path from the filename and creates a sort key
     based on its structure.
     """
-    parts = filename.replace("https_", "").replace("http_", "").split("_")
+    parts = filename.removeprefix("https_").removeprefix("http_").split("_")
     if len(parts) > 1:
-        domain_and_path = "_".join(parts[1:])
-        path_segments = [p for p in domain_and_path.split("_") if p and p != "txt"]
+        path_segments = [p for p in parts[1:] if p and p != "txt"]
         return (len(path_segments), path_segments)
     else:
         return (0, [filename])
@@ -24,27 +23,28 @@ def combine_text_files_ordered_by_url(directory_path, output_filename="combined_
         output_filename (str, optional): The name of the output file.
                                        Defaults to "combined_text.txt".
     """
-    all_text_files = [f for f in os.listdir(directory_path) if f.endswith(".txt")]
+    with os.scandir(directory_path) as it:
+        all_text_files = [e for e in it
+                          if e.name.endswith(".txt") and e.name != output_filename and e.is_file()]
 
     # Sort the files based on the URL structure
-    sorted_files = sorted(all_text_files, key=get_sort_key)
-
-    combined_content = ""
-    for filename in sorted_files:
-        filepath = os.path.join(directory_path, filename)
-        try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                content = file.read()
-                combined_content += f"-- Start of {filename} --\n"
-                combined_content += content
-                combined_content += "\n-- End of {filename} --\n\n"
-        except Exception as e:
-            print(f"Error reading file {filename}: {e}")
+    sorted_files = sorted(all_text_files, key=lambda e: get_sort_key(e.name))
 
     try:
         output_filepath = os.path.join(directory_path, output_filename)
-        with open(output_filepath, 'w', encoding='utf-8') as outfile:
-            outfile.write(combined_content)
+        with open(output_filepath, 'w', encoding='utf-8', buffering=1 << 20) as outfile:
+            for entry in sorted_files:
+                filename = entry.name
+                # read the whole file first so a decode error leaves no partial entry behind
+                try:
+                    with open(entry.path, 'r', encoding='utf-8') as infile:
+                        content = infile.read()
+                except Exception as e:
+                    print(f"Error reading file {filename}: {e}")
+                    continue
+                outfile.write(f"-- Start of {filename} --\n")
+                outfile.write(content)
+                outfile.write(f"\n-- End of {filename} --\n\n")
         print(f"Successfully combined {len(sorted_files)} text files into {output_filename} in {directory_path}, ordered by URL structure.")
     except Exception as e:
         print(f"Error writing to output file {output_filename}: {e}")
@@ -1,14 +1,26 @@
 
-import requests
+import asyncio
+import contextlib
+import logging
+import aiohttp
 from bs4 import BeautifulSoup
 import os
 import urllib.parse
+from collections import deque
+from functools import lru_cache
 
+log = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=100_000)
+def _parse(url):
+    return urllib.parse.urlparse(url)
+
+
+@lru_cache(maxsize=100_000)
 def normalize_url(base_url, url):
-    print(f"  [normalize_url] base_url: {base_url}, url: {url}")
-    base_parsed = urllib.parse.urlparse(base_url)
-    parsed_url = urllib.parse.urlparse(url)
+    base_parsed = _parse(base_url)
+    parsed_url = _parse(url)
 
     scheme = base_parsed.scheme
     netloc = parsed_url.netloc or base_parsed.netloc
@@ -17,86 +29,132 @@ def normalize_url(base_url, url):
     query = parsed_url.query
     fragment = ''
 
-    normalized_url = urllib.parse.urlunparse((scheme, netloc, path, params, query, fragment))
-    print(f"  [normalize_url] Normalized URL: {normalized_url}")
-    return normalized_url
+    return urllib.parse.urlunparse((scheme, netloc, path, params, query, fragment))
 
 
-def find_internal_links(base_url, max_links=100):
-    try:
-        domain = urllib.parse.urlparse(base_url).netloc
-        print(f"Scanning domain: {domain}")
-        visited_urls = set()
-        normalized_base_url = normalize_url(base_url, base_url)
-        unvisited_urls = {normalized_base_url}
-        all_internal_links = set()
-
-        print(f"  [find_internal_links] Initial unvisited_urls: {unvisited_urls}")
-
-        while unvisited_urls and len(all_internal_links) < max_links:
-            current_url = unvisited_urls.pop()
-            current_url = normalize_url(base_url, current_url)
-            print(f"  Checking: {current_url}")
-            if current_url in visited_urls:
-                print("    Already visited")
-                continue
-
-            try:
-                response = requests.get(current_url)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
-                visited_urls.add(current_url)
-
-                print(f"  [find_internal_links] Finding links in: {current_url}")
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    print(f"  [find_internal_links] Found href: {href}")
-                    full_url = urllib.parse.urljoin(current_url, href)
-                    normalized_full_url = normalize_url(base_url, full_url)
-                    parsed_full_url = urllib.parse.urlparse(full_url)
-
-                    if parsed_full_url.netloc == domain and normalized_full_url not in all_internal_links:
-                        print(f"    Found internal link: {normalized_full_url}")
-                        all_internal_links.add(normalized_full_url)
-                        unvisited_urls.add(normalized_full_url)
-
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching URL {current_url}: {e}")
-            except Exception as e:
-                print(f"An error occurred while processing {current_url}: {e}")
-
-        print(f"Found {len(all_internal_links)} internal links.")
-        return all_internal_links
+def make_session(limit=100, limit_per_host=10):
+    timeout = aiohttp.ClientTimeout(total=30, connect=10)
+    connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host, ttl_dns_cache=300)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, raise_for_status=True)
+
+
+async def fetch(session, url, sem=None):
+    async with sem or contextlib.nullcontext():
+        async with session.get(url) as response:
+            # raw bytes: BeautifulSoup sniffs <meta charset> when the header has none
+            return await response.read()
+
+
+def page_filename(output_dir, url):
+    parsed_link = _parse(url)
+    path = parsed_link.path.replace("/", "_")
+    if not path:
+        path = "homepage"
+    return os.path.join(output_dir, f"{parsed_link.netloc}{path}.txt")
+
+
+def extract_visible_text(soup):
+    for tag in soup(['script', 'style', 'noscript', 'svg', 'iframe']):
+        tag.decompose()
+
+    return " ".join(soup.get_text(" ", strip=True).split())
+
 
+def write_text_file(filename, text):
+    with open(filename, 'w', encoding='utf-8') as file:
+        file.write(text)
+
+
+async def save_text(url, filename, text):
+    # disk writes run in a worker thread so they overlap with pending fetches
+    try:
+        await asyncio.to_thread(write_text_file, filename, text)
+        print(f"Successfully scraped text from {url} and saved to {filename}")
     except Exception as e:
-        print(f"An error occurred during the link discovery process: {e}")
-        return set()
+        print(f"An error occurred during scraping or saving: {e}")
 
 
-def scrape_text(url, filename="scraped_text.txt"):
+# Fetches each internal page once: the same soup yields both the links for
+# the next BFS level and the visible text saved to output_dir.
+async def crawl_and_scrape(session, base_url, output_dir, max_links=100, concurrency=20):
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        domain = _parse(base_url).netloc
+        print(f"Scanning domain: {domain}")
+        sem = asyncio.Semaphore(concurrency)
+        normalized_base_url = normalize_url(base_url, base_url)
+        frontier = deque([normalized_base_url])
+        enqueued = {normalized_base_url}
+        scraped_urls = set()
+        pending_writes = []
+        scheduled_files = set()
+        debug = log.isEnabledFor(logging.DEBUG)
+
+        log.debug("crawl_and_scrape initial frontier=%s", frontier)
+
+        while frontier:
+            batch = [frontier.popleft() for _ in range(len(frontier))]
+
+            log.debug("crawl_and_scrape fetching %d pages", len(batch))
+            results = await asyncio.gather(*(fetch(session, url, sem) for url in batch),
+                                           return_exceptions=True)
+
+            for current_url, result in zip(batch, results):
+                if isinstance(result, (aiohttp.ClientError, asyncio.TimeoutError)):
+                    print(f"Error fetching URL {current_url}: {result}")
+                    continue
+                if isinstance(result, Exception):
+                    print(f"An error occurred while processing {current_url}: {result}")
+                    continue
 
-        for script in soup.find_all(['script', 'style']):
-            script.extract()
+                try:
+                    soup = BeautifulSoup(result, 'lxml')
+                    log.debug("crawl_and_scrape parsing url=%s", current_url)
+                    for link in soup.find_all('a', href=True):
+                        full_url = urllib.parse.urljoin(current_url, link['href'])
+                        if _parse(full_url).netloc != domain:
+                            continue
+                        normalized_full_url = normalize_url(base_url, full_url)
+                        if normalized_full_url not in enqueued and len(enqueued) < max_links:
+                            if debug:
+                                log.debug("crawl_and_scrape found url=%s", normalized_full_url)
+                            enqueued.add(normalized_full_url)
+                            frontier.append(normalized_full_url)
+
+                    text = extract_visible_text(soup)
+                    filename = page_filename(output_dir, current_url)
+                    # page_filename drops the query string, so two URLs can share a file;
+                    # keep the first rather than let concurrent writes interleave
+                    if filename in scheduled_files:
+                        print(f"Skipping {current_url}: {filename} is already being written")
+                        continue
+                    scheduled_files.add(filename)
+                    pending_writes.append(asyncio.create_task(save_text(current_url, filename, text)))
+                    scraped_urls.add(current_url)
+                except Exception as e:
+                    print(f"An error occurred during scraping or saving: {e}")
+
+        await asyncio.gather(*pending_writes)
+        print(f"Scraped {len(scraped_urls)} internal pages.")
+        return scraped_urls
 
-        text_parts = soup.stripped_strings
-        visible_text = "\n".join(text_parts)
+    except Exception as e:
+        print(f"An error occurred during the crawl: {e}")
+        return set()
 
-        with open(filename, 'w', encoding='utf-8') as file:
-            file.write(visible_text)
 
-        print(f"Successfully scraped text from {url} and saved to {filename}")
+async def scrape_text(session, url, filename="scraped_text.txt", sem=None):
+    try:
+        html = await fetch(session, url, sem)
+        soup = BeautifulSoup(html, 'lxml')
+        await save_text(url, filename, extract_visible_text(soup))
 
-    except requests.exceptions.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         print(f"Error fetching URL {url}: {e}")
     except Exception as e:
         print(f"An error occurred during scraping or saving: {e}")
 
 
-def scrape_domain_text(base_url, output_directory="scraped_content"):
+async def scrape_domain_text(base_url, output_directory="scraped_content", concurrency=20):
     while True:
         output_dir = input("Enter the name of the directory to save the scraped content (or 'new' to create a new directory): ")
         if output_dir.lower() == 'new':
@@ -116,16 +174,14 @@ def scrape_domain_text(base_url, output_directory="scraped_content"):
         else:
             print(f"Directory '{output_dir}' does not exist.")
 
-    internal_links = find_internal_links(base_url)
-    print(f"Found {len(internal_links)} internal links on {base_url}")
+    async with make_session() as session:
+        scraped_urls = await crawl_and_scrape(session, base_url, output_dir, concurrency=concurrency)
+        print(f"Scraped {len(scraped_urls)} pages on {base_url}")
+
 
-    for link in internal_links:
-        parsed_link = urllib.parse.urlparse(link)
-        path = parsed_link.path.replace("/", "_")
-        if not path:
-            path = "homepage"
-        filename = os.path.join(output_dir, f"{parsed_link.netloc}{path}.txt")
-        scrape_text(link, filename)
+async def scrape_single_url(url, filename):
+    async with make_session() as session:
+        await scrape_text(session, url, filename)
 
 
 if __name__ == "__main__":
@@ -138,9 +194,9 @@ if __name__ == "__main__":
     if choice == '1':
         url_to_scrape = input("Enter the URL to scrape: ")
         output_filename = input("Enter the desired filename (e.g., output.txt): ")
-        scrape_text(url_to_scrape, output_filename)
+        asyncio.run(scrape_single_url(url_to_scrape, output_filename))
     elif choice == '2':
         domain_to_scan = input("Enter the base URL of the domain to scan (e.g., https://help.current-rms.com/en/): ")
-        scrape_domain_text(domain_to_scan)
+        asyncio.run(scrape_domain_text(domain_to_scan))
     else:
         print("Invalid choice.")
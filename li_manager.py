@@ -22,8 +22,10 @@ Only standard library.
 """
 
 import os
+import re
 import sys
 from datetime import datetime
+from functools import lru_cache
 from typing import Tuple
 
 # Import core module
@@ -44,12 +46,12 @@ def timestamp() -> str:
     # MMDDYY_HHMM (local time)
     return datetime.now().strftime("%m%d%y_%H%M")
 
+# anything that is not a (Unicode) letter or digit
+_LABEL_RE = re.compile(r"[\W_]+")
+
 def sanitize_label(s: str) -> str:
     # for filenames: strip spaces and non-filename-friendly chars
-    keep = []
-    for ch in s:
-        keep.append(ch if ch.isalnum() else "")
-    out = "".join(keep)
+    out = _LABEL_RE.sub("", s)
     return out if out else "Text"
 
 def read_multiline() -> str:
@@ -79,10 +81,15 @@ def read_input_text() -> str:
 def save_text(dirpath: str, basename: str, content: str) -> str:
     os.makedirs(dirpath, exist_ok=True)
     path = os.path.join(dirpath, basename)
-    with open(path, "w", encoding="utf-8") as f:
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
         f.write(content)
     return path
 
+@lru_cache(maxsize=1)
+def _lex() -> dict:
+    # parsed ./lexicons, loaded once; call _lex.cache_clear() after writing a new lexicon
+    return core.discover_lexicons(core.LEX_DIR)
+
 # ---------- UI flows ----------
 
 def pick_language_code() -> str:
@@ -108,7 +115,7 @@ def ensure_language_lexicon(lang_code: str) -> Tuple[str, list]:
     If missing, offer to build from a user-provided corpus .txt via lexicon_builder.
     Returns (theme_key, words)
     """
-    lexicons = core.discover_lexicons(core.LEX_DIR)
+    lexicons = _lex()
     if lang_code in lexicons:
         return lang_code, lexicons[lang_code]
 
@@ -119,15 +126,16 @@ def ensure_language_lexicon(lang_code: str) -> Tuple[str, list]:
         # build and save to ./lexicons/<lang_code>.txt
         saved_path = build_lexicon_file(src, os.path.join(core.LEX_DIR, f"{lang_code}.txt"))
         print(f"Built and saved lexicon: {saved_path}")
-        lexicons = core.discover_lexicons(core.LEX_DIR)  # reload
+        _lex.cache_clear()
+        lexicons = _lex()  # reload
         if lang_code in lexicons:
             return lang_code, lexicons[lang_code]
         else:
             print("Lexicon still not found after build; falling back to 'latin'.")
-    return "latin", core.discover_lexicons(core.LEX_DIR)["latin"]
+    return "latin", _lex()["latin"]
 
 def pick_theme() -> Tuple[str, str, list]:
-    lexicons = core.discover_lexicons(core.LEX_DIR)
+    lexicons = _lex()
     keys = sorted(lexicons.keys())
     print("\nAvailable THEMES (from ./lexicons):")
     for i, k in enumerate(keys, 1):
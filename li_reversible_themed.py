@@ -15,16 +15,28 @@ Features
 - Synthesizes extra theme-looking tokens if lexicon runs short, ensuring uniqueness
 """
 
+import io
 import os
 import re
 import sys
 import json
 import uuid
 import time
-import hashlib
+import functools
 import random
+import zlib
 from typing import Dict, List, Tuple
 
+try:
+    import orjson  # optional: much faster mapping saves when installed
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # optional: compact binary sidecar for faster mapping loads
+except ImportError:
+    msgpack = None
+
 # ----------------------------
 # Paths / dirs
 # ----------------------------
@@ -70,30 +82,32 @@ def discover_lexicon_codes(folder: str = LEX_DIR) -> set:
 # Tokenization & casing (Unicode-friendly)
 # ----------------------------
 
-# group 1 = "word" (letters only), group 2 = everything else (punct/whitespace/digits)
-TOKEN_RE = re.compile(r"([^\W\d_]+|[\W\d_]+)", re.UNICODE)
-
-def tokenize(text: str) -> List[str]:
-    return TOKEN_RE.findall(text)
-
-def casing_type(word: str) -> str:
+# group "w" = word (letters only), group "o" = everything else (punct/whitespace/digits);
+# callers branch on m.lastgroup instead of re-classifying each token with isalpha()
+# Keep these on stdlib re: decode must split text exactly as encode did, and engines such as
+# the third-party `regex` module define \w differently (e.g. combining marks count as word chars).
+TOKEN_RE = re.compile(r"(?P<w>[^\W\d_]+)|(?P<o>[\W\d_]+)", re.UNICODE)
+# just the "w" alternative: matches exactly the word tokens of TOKEN_RE
+WORD_RE = re.compile(r"[^\W\d_]+", re.UNICODE)
+# ASCII-only twins: on ASCII text they split identically but skip the Unicode category lookups
+TOKEN_RE_ASCII = re.compile(r"(?P<w>[A-Za-z]+)|(?P<o>[^A-Za-z]+)", re.ASCII)
+WORD_RE_ASCII = re.compile(r"[A-Za-z]+", re.ASCII)
+
+# casing codes: 0=upper, 1=title, 2=lower, 3=mixed (indexes into _CASE_FNS)
+@functools.lru_cache(maxsize=4096)
+def _casing_code(word: str) -> int:
     if word.isupper():
-        return "upper"
+        return 0
     if word[:1].isupper() and word[1:].islower():
-        return "title"
+        return 1
     if word.islower():
-        return "lower"
-    return "mixed"
+        return 2
+    return 3
+
+_CASE_FNS = (str.upper, str.capitalize, lambda s: s, lambda s: s)
 
 def apply_casing(src_form: str, dest_lower: str) -> str:
-    c = casing_type(src_form)
-    if c == "upper":
-        return dest_lower.upper()
-    if c == "title":
-        return dest_lower.capitalize()
-    if c == "lower":
-        return dest_lower
-    return dest_lower
+    return _CASE_FNS[_casing_code(src_form)](dest_lower)
 
 # ----------------------------
 # Built-in Latin lexicon (fallback if no file provided)
@@ -126,8 +140,25 @@ PREFERRED_ENDINGS_PLURAL = ("a","ae","i","es","um","us")
 # Lexicon loading & synthesis helpers
 # ----------------------------
 
+# bump whenever load_lexicon_from_file parses differently, so old .cache files are ignored
+LEXICON_CACHE_VERSION = 1
+
 def load_lexicon_from_file(path: str) -> List[str]:
+    # parsed words are cached next to the file as <path>.cache (plain JSON, never pickle:
+    # lexicon packs come from elsewhere), keyed on format version + mtime + size
+    cache_path = path + ".cache"
+    header = None
+    try:
+        st = os.stat(path)
+        header = [LEXICON_CACHE_VERSION, st.st_mtime_ns, st.st_size]
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached_header, cached_words = json.load(f)
+        if cached_header == header and isinstance(cached_words, list):
+            return cached_words
+    except Exception:
+        pass  # no cache yet, or stale/corrupt: parse below
     words: List[str] = []
+    read_ok = True
     try:
         with open(path, "r", encoding="utf-8") as f:
             for line in f:
@@ -140,11 +171,18 @@ def load_lexicon_from_file(path: str) -> List[str]:
                         words.append(w)
     except Exception as e:
         print(f"[WARN] Failed to read lexicon '{path}': {e}", file=sys.stderr)
+        read_ok = False  # keep the words read so far, but don't cache a partial list
     seen = set(); out = []
     for w in words:
         lw = w.strip()
         if lw and lw not in seen:
             seen.add(lw); out.append(lw)
+    if header is not None and read_ok:
+        try:
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump([header, out], f, ensure_ascii=False)
+        except OSError:
+            pass  # read-only lexicon dir: just parse again next run
     return out
 
 def discover_lexicons(folder: str = LEX_DIR) -> Dict[str, List[str]]:
@@ -165,43 +203,65 @@ def discover_lexicons(folder: str = LEX_DIR) -> Dict[str, List[str]]:
 
 def build_syllables_from_lexicon(words: List[str]) -> List[str]:
     chunks: List[str] = []
+    seen: set = set()
+    add_seen = seen.add; add_chunk = chunks.append
     for w in words:
         lw = w.lower()
-        lw = re.sub(r"^[^A-Za-z]+|[^A-Za-z]+$", "", lw)
+        # trim non a-z from both ends (usually a no-op, so skip the regex engine)
+        s = 0; e = len(lw)
+        while s < e and not ("a" <= lw[s] <= "z"):
+            s += 1
+        while e > s and not ("a" <= lw[e-1] <= "z"):
+            e -= 1
+        lw = lw[s:e]
         for size in (2, 3):
             for i in range(0, max(0, len(lw) - size + 1), size):
                 piece = lw[i:i+size]
-                if len(piece) >= 2 and piece.isalpha():
-                    chunks.append(piece)
+                if piece not in seen and len(piece) >= 2 and piece.isalpha():
+                    add_seen(piece); add_chunk(piece)
     if not chunks:
         chunks = ["lo","rem","ip","sum","ne","on","vec","tor","syn","th"]
-    seen = set(); out = []
-    for c in chunks:
-        if c not in seen:
-            seen.add(c); out.append(c)
+    return chunks
+
+def _alpha_suffix(n: int) -> str:
+    # 1 -> "a", 26 -> "z", 27 -> "aa", ... (letters only, so the token stays one word)
+    out = ""
+    while n > 0:
+        n, r = divmod(n - 1, 26)
+        out = chr(97 + r) + out
     return out
 
 def synthesize_from_theme(target_len: int, seed_int: int, syllables: List[str], used: set) -> str:
-    rng = random.Random(seed_int)
+    choice = random.Random(seed_int).choice
     token = ""
     while len(token) < target_len:
-        token += rng.choice(syllables)
+        token += choice(syllables)
     token = token[:target_len]
-    base = token; n = 1
-    while token in used:
-        token = (base + rng.choice(["x","um","us","ix","on","a"]))[:max(target_len, len(base)+1)]
+    if token not in used:
+        return token
+    # one stylistic retry, then a collision-free counter suffix; the suffix must be letters,
+    # since digits would be split off by the tokenizer and the token could not be decoded
+    cand = (token + choice(["x","um","us","ix","on","a"]))[:max(target_len, len(token)+1)]
+    n = 1
+    while cand in used:
+        cand = token + _alpha_suffix(n)
         n += 1
-        if n > 10 and token in used:
-            token = f"{base}{n}"
-    return token
+    return cand
 
 # ----------------------------
 # Mapping persistence
 # ----------------------------
 
+def _dumps(obj) -> bytes:
+    # same indented UTF-8 layout either way; orjson just encodes it far faster
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
 def save_mapping(map_id: str, forward_map: Dict[str, str], meta: Dict) -> str:
     """
-    Saves mapping to ./mappings/<id>.json
+    Saves mapping to ./mappings/<id>.json (plus <id>.msgpack when msgpack is installed;
+    the JSON stays the human-readable copy, decode reloads the sidecar unless the JSON is newer)
     forward_map: src_lower -> themed_lower
     meta: {created, source_lang, theme_key, theme_name}
     """
@@ -212,47 +272,93 @@ def save_mapping(map_id: str, forward_map: Dict[str, str], meta: Dict) -> str:
         "source_lang": meta.get("source_lang", "unknown"),
         "theme_key": meta.get("theme_key", ""),
         "theme_name": meta.get("theme_name", ""),
-        "note": "forward_map is src_lower -> themed_lower; reverse is derivable.",
+        "note": "forward_map is src_lower -> themed_lower; reverse_map is its inverse, stored for decode.",
         "forward_map": forward_map,
+        "reverse_map": {v: k for k, v in forward_map.items()},
     }
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    with open(path, "wb") as f:
+        f.write(_dumps(payload))
+    if msgpack is not None:
+        with open(os.path.join(MAP_DIR, f"{map_id}.msgpack"), "wb") as f:
+            msgpack.pack(payload, f, use_bin_type=True)
     return path
 
 def load_reverse_map(map_id: str) -> Tuple[Dict[str, str], Dict]:
     path = os.path.join(MAP_DIR, f"{map_id}.json")
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    fwd = data["forward_map"]
-    rev = {v: k for k, v in fwd.items()}
+    mp_path = os.path.join(MAP_DIR, f"{map_id}.msgpack")
+    use_sidecar = False
+    if msgpack is not None:
+        # the sidecar only counts if it's not older than the JSON (edited/replaced JSON wins)
+        try:
+            use_sidecar = os.stat(mp_path).st_mtime_ns >= os.stat(path).st_mtime_ns
+        except OSError:
+            use_sidecar = os.path.exists(mp_path) and not os.path.exists(path)
+    if use_sidecar:
+        with open(mp_path, "rb") as f:
+            data = msgpack.unpack(f, raw=False)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    rev = data.get("reverse_map")
+    if rev is None:  # mappings saved before reverse_map was stored
+        rev = {v: k for k, v in data["forward_map"].items()}
     return rev, data
 
 # ----------------------------
 # Core encode/decode
 # ----------------------------
 
+def bucket_theme_words(theme_words: List[str]) -> Tuple[Dict[int, List[str]], Dict[int, List[str]]]:
+    """
+    Lowercases the lexicon once and buckets it by length.
+    Returns (by_len, by_len_plural); the second holds only words with a plural-looking ending.
+    """
+    by_len: Dict[int, List[str]] = {}
+    by_len_plural: Dict[int, List[str]] = {}
+    for w in theme_words:
+        lw = w.lower()
+        by_len.setdefault(len(lw), []).append(lw)
+        if lw.endswith(PREFERRED_ENDINGS_PLURAL):
+            by_len_plural.setdefault(len(lw), []).append(lw)
+    return by_len, by_len_plural
+
 def pick_theme_replacement(src_lower: str,
                            desired_len: int,
                            used: set,
-                           rng: random.Random,
-                           theme_words: List[str],
+                           by_len: Dict[int, List[str]],
+                           by_len_plural: Dict[int, List[str]],
                            theme_syllables: List[str]) -> str:
-    pluralish = src_lower.endswith("s")
-    candidates = [w for w in theme_words if abs(len(w) - desired_len) <= 1 and w.lower() not in used]
-    if pluralish:
-        prioritized = [w for w in candidates
-                       if w.lower().endswith(("a","ae","i","es","um","us"))]
-        if prioritized:
-            candidates = prioritized
+    # deterministic, not cryptographic: a crc32 of the source word picks the candidate
+    # and (salted) seeds the synthesizer
+    h = zlib.crc32(src_lower.encode("utf-8"))
+    lens = (desired_len - 1, desired_len, desired_len + 1)
+    candidates: List[str] = []
+    if src_lower.endswith("s"):
+        candidates = [w for n in lens for w in by_len_plural.get(n, ()) if w not in used]
+    if not candidates:
+        candidates = [w for n in lens for w in by_len.get(n, ()) if w not in used]
     if candidates:
-        choice = rng.choice(candidates).lower()
+        choice = candidates[h % len(candidates)]
         used.add(choice)
         return choice
-    seed_int = int(hashlib.sha256(src_lower.encode("utf-8")).hexdigest(), 16)
-    synth = synthesize_from_theme(max(3, desired_len), seed_int, theme_syllables, used)
+    synth = synthesize_from_theme(max(3, desired_len), h ^ 0xA5A5A5A5, theme_syllables, used)
     used.add(synth)
     return synth
 
+def _build_forward(distinct: Dict[str, int], theme_words: List[str]) -> Dict[str, str]:
+    """
+    Builds forward_map (src_lower -> themed_lower) in one pass over the distinct source forms.
+    distinct: src_lower -> desired length, in first-occurrence order (keeps picks deterministic)
+    """
+    forward_map: Dict[str, str] = {}
+    used_theme: set = set()
+    theme_syllables = build_syllables_from_lexicon(theme_words)
+    by_len, by_len_plural = bucket_theme_words(theme_words)
+    for src_lower, desired_len in distinct.items():
+        forward_map[src_lower] = pick_theme_replacement(src_lower, desired_len, used_theme,
+                                                        by_len, by_len_plural, theme_syllables)
+    return forward_map
+
 def encode_to_theme(text: str,
                     source_lang: str,
                     theme_key: str,
@@ -261,24 +367,21 @@ def encode_to_theme(text: str,
     """
     Returns (output_with_header, map_id)
     """
-    rng = random.Random(42)  # stable candidate order
-    forward_map: Dict[str, str] = {}
-    used_theme: set = set()
-    theme_syllables = build_syllables_from_lexicon(theme_words)
-
-    out: List[str] = []
-    for tok in tokenize(text):
-        if tok.isalpha():
-            src_lower = tok.lower()
-            if src_lower in forward_map:
-                themed_lower = forward_map[src_lower]
-            else:
-                themed_lower = pick_theme_replacement(src_lower, len(tok), used_theme, rng,
-                                                      theme_words, theme_syllables)
-                forward_map[src_lower] = themed_lower
-            out.append(apply_casing(tok, themed_lower))
-        else:
-            out.append(tok)
+    # phase 1: distinct surface forms, then distinct lowercase forms (first-occurrence order)
+    # -> length of that first occurrence; each surface form is lowercased exactly once
+    word_re = WORD_RE_ASCII if text.isascii() else WORD_RE
+    surfaces: Dict[str, str] = {tok: tok.lower() for tok in dict.fromkeys(word_re.findall(text))}
+    distinct: Dict[str, int] = {}
+    for tok, src_lower in surfaces.items():
+        distinct.setdefault(src_lower, len(tok))
+
+    # phase 2: resolve each distinct form once
+    forward_map = _build_forward(distinct, theme_words)
+
+    # phase 3: render every surface form once; the regex engine walks the text and
+    # Python only runs a dict lookup per word occurrence
+    rendered = {tok: apply_casing(tok, forward_map[src_lower]) for tok, src_lower in surfaces.items()}
+    encoded = word_re.sub(lambda m: rendered[m.group()], text)
 
     map_id = str(uuid.uuid4())
     meta = {
@@ -290,7 +393,7 @@ def encode_to_theme(text: str,
     save_mapping(map_id, forward_map, meta)
 
     header = f"[LI-MAP-ID: {map_id}] [THEME: {theme_key}] [LANG: {source_lang}]\n"
-    return header + "".join(out), map_id
+    return header + encoded, map_id
 
 HEADER_RE = re.compile(r"\[LI-MAP-ID:\s*([0-9a-fA-F-]{36})\]")
 
@@ -304,18 +407,18 @@ def extract_map_id(text: str) -> Tuple[str, str]:
 
 def decode_to_original(text: str, map_id: str) -> str:
     rev_map, _meta = load_reverse_map(map_id)
-    out: List[str] = []
-    for tok in tokenize(text):
-        if tok.isalpha():
-            themed_lower = tok.lower()
-            if themed_lower in rev_map:
-                src_lower = rev_map[themed_lower]
-                out.append(apply_casing(tok, src_lower))
-            else:
-                out.append(tok)
+    # stream into one buffer rather than holding every token in a list until the final join
+    buf = io.StringIO()
+    write = buf.write; rev_get = rev_map.get; recase = apply_casing  # hoisted for the hot loop
+    token_re = TOKEN_RE_ASCII if text.isascii() else TOKEN_RE
+    for m in token_re.finditer(text):
+        tok = m.group()
+        if m.lastgroup == "w":
+            src_lower = rev_get(tok.lower())
+            write(tok if src_lower is None else recase(tok, src_lower))
         else:
-            out.append(tok)
-    return "".join(out)
+            write(tok)
+    return buf.getvalue()
 
 # ----------------------------
 # Minimal CLI (optional)